@@ -1,6 +1,12 @@
+import numpy as np
 from aiohttp import web
 
-from api.endpoints.utils import graph_title, validate_query_keys, validate_since_case
+from api.endpoints.utils import (
+    graph_title,
+    validate_query_keys,
+    validate_series,
+    validate_since_case,
+)
 from country_day_data import filter_countries
 from utils import axes_data
 
@@ -13,13 +19,22 @@ async def data_endpoint(request: web.Request) -> web.Response:
     series = request.query.get("series", "confirmed").split(",")
     since_case = request.query.get("since")
 
+    timings = request["timings"]
+
     validate_query_keys(request.query.keys())
+    validate_series(series)
     validate_since_case(since_case)
-    countries = [
-        {"country": country.to_dict_without_days(), "label": label, "axes": axes}
-        for country, label, axes in axes_data(
-            filter_countries(request.app["data"], country_names)
-        )
-    ]
+    with timings.stage("filter"):
+        filtered = filter_countries(request.app["data"], country_names)
+    with timings.stage("axes"):
+        countries = [
+            {
+                "country": country.to_dict_without_days(),
+                "label": label,
+                "axes": [np.datetime_as_string(x).tolist(), y.tolist()],
+            }
+            for country, label, (x, y) in axes_data(filtered, series)
+        ]
 
-    return web.json_response({"title": graph_title(series), "countries": countries})
+    with timings.stage("json"):
+        return web.json_response({"title": graph_title(series), "countries": countries})
@@ -4,12 +4,19 @@ from aiohttp import web
 
 from api.endpoints.utils import (
     graph_title,
+    negotiate_format,
+    validate_colors,
+    validate_compression,
+    validate_downsample,
+    validate_image_options,
+    validate_layout,
     validate_query_keys,
     validate_scale,
+    validate_sharey,
     validate_since_case,
 )
 from country_day_data import filter_countries
-from graphs import graph, graph_since_nth_case
+from graphs import CONTENT_TYPES, ImageOptions, graph, graph_grid, graph_since_nth_case
 from utils import axes_data
 
 from .routes import routes
@@ -21,19 +28,79 @@ async def graph_endpoint(request: web.Request) -> web.Response:
     series = request.query.get("series", "confirmed").split(",")
     since_case = request.query.get("since")
     scale = request.query.get("scale", "linear")
+    downsample = request.query.get("downsample", "true")
+    compression = request.query.get("compression")
+    colors = request.query.get("colors")
+    layout = request.query.get("layout", "overlay")
+    sharey = request.query.get("sharey", "true")
+
+    timings = request["timings"]
 
     validate_query_keys(request.query.keys())
     validate_scale(scale)
+    validate_downsample(downsample)
     validate_since_case(since_case)
-    countries = filter_countries(request.app["data"], country_names)
-
-    image = (
-        await graph(axes_data(countries, series), graph_title(series), scale)
-        if since_case is None
-        else await graph_since_nth_case(
-            axes_data(countries, series), graph_title(series), scale, int(since_case)
-        )
+    validate_sharey(sharey)
+    image_format = negotiate_format(
+        request.query.get("format"), request.headers.get("Accept", "")
+    )
+    validate_compression(compression, image_format)
+    validate_colors(colors, image_format)
+    options = ImageOptions(
+        image_format,
+        int(compression) if compression is not None else None,
+        int(colors) if colors is not None else None,
     )
+    validate_image_options(options)
+
+    with timings.stage("filter"):
+        countries = filter_countries(request.app["data"], country_names)
+    validate_layout(layout, since_case, countries)
+
+    cache_key = (
+        request.app.get("data_version"),
+        tuple(c.identifier for c in countries),
+        tuple(series),
+        since_case,
+        scale,
+        downsample,
+        layout,
+        sharey,
+        options,
+    )
+    with timings.stage("cache"):
+        image_bytes = request.app["render_cache"].get(cache_key)
+
+    if image_bytes is None:
+        with timings.stage("axes"):
+            axes = axes_data(countries, series)
+
+        if layout == "grid":
+            image = await graph_grid(
+                axes,
+                graph_title(series),
+                scale,
+                sharey == "true",
+                downsample == "true",
+                options,
+                timings,
+            )
+        elif since_case is None:
+            image = await graph(
+                axes, graph_title(series), scale, downsample == "true", options, timings
+            )
+        else:
+            image = await graph_since_nth_case(
+                axes,
+                graph_title(series),
+                scale,
+                int(since_case),
+                downsample == "true",
+                options,
+                timings,
+            )
+        image_bytes = image.getvalue()
+        request.app["render_cache"].put(cache_key, image_bytes)
 
     filename = "_".join(
         [
@@ -41,17 +108,19 @@ async def graph_endpoint(request: web.Request) -> web.Response:
             *[c.country.alpha_2.lower() for c in countries],
         ]
     )
+    if layout == "grid":
+        filename += "_grid"
 
-    image_bytes = image.getvalue()
     return web.Response(
         body=image_bytes,
         headers={
             "Content-Disposition": (
-                f'filename="{filename}.png"'
+                f'filename="{filename}.{image_format}"'
                 if since_case is None
-                else f'filename="{filename}_since_{since_case}.png"'
+                else f'filename="{filename}_since_{since_case}.{image_format}"'
             ),
             "Content-Length": str(len(image_bytes)),
-            "Content-Type": "image/png",
+            "Content-Type": CONTENT_TYPES[image_format],
+            "Vary": "Accept",
         },
     )
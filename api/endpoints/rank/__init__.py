@@ -0,0 +1,7 @@
+from .rank import rank_endpoint
+from .routes import routes as rank_routes
+
+__all__ = (
+    "rank_endpoint",
+    "rank_routes",
+)
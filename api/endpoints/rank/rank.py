@@ -0,0 +1,34 @@
+from aiohttp import web
+
+from api.endpoints.utils import (
+    validate_query_keys,
+    validate_rank_by,
+    validate_series,
+    validate_top,
+)
+
+from .routes import routes
+
+
+@routes.get("/rank")
+async def rank_endpoint(request: web.Request) -> web.Response:
+    series = request.query.get("series", "confirmed")
+    by = request.query.get("by", "total")
+    top = request.query.get("top", "10")
+
+    timings = request["timings"]
+
+    validate_query_keys(request.query.keys())
+    validate_series([series])
+    validate_rank_by(by)
+    validate_top(top)
+    with timings.stage("rank"):
+        countries = [
+            {"rank": rank, "country": country.to_dict_without_days(), "value": value}
+            for rank, (country, value) in enumerate(
+                request.app["data"].top(series, by, int(top)), 1
+            )
+        ]
+
+    with timings.stage("json"):
+        return web.json_response({"series": series, "by": by, "countries": countries})
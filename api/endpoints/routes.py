@@ -2,11 +2,13 @@ from aiohttp import web
 
 from .data import data_routes
 from .graph import graph_routes
+from .rank import rank_routes
 from .update_data import update_data_routes
 
 route_tables = (
     data_routes,
     graph_routes,
+    rank_routes,
     update_data_routes,
 )
 
@@ -1,11 +1,31 @@
 from .graph_title import graph_title
+from .negotiate_format import negotiate_format
+from .validate_colors import validate_colors
+from .validate_compression import validate_compression
+from .validate_downsample import validate_downsample
+from .validate_image_options import validate_image_options
+from .validate_layout import validate_layout
 from .validate_query_keys import validate_query_keys
+from .validate_rank_by import validate_rank_by
 from .validate_scale import validate_scale
+from .validate_series import validate_series
+from .validate_sharey import validate_sharey
 from .validate_since_case import validate_since_case
+from .validate_top import validate_top
 
 __all__ = (
     "graph_title",
+    "negotiate_format",
+    "validate_colors",
+    "validate_compression",
+    "validate_downsample",
+    "validate_image_options",
+    "validate_layout",
     "validate_query_keys",
+    "validate_rank_by",
     "validate_scale",
+    "validate_series",
+    "validate_sharey",
     "validate_since_case",
+    "validate_top",
 )
@@ -0,0 +1,40 @@
+from aiohttp import web
+
+from graphs import CONTENT_TYPES, HAS_PILLOW
+
+
+def _accepted_formats(accept: str):
+    by_content_type = {v: k for k, v in CONTENT_TYPES.items()}
+    accepted = []
+    for i, media_range in enumerate(accept.split(",")):
+        content_type, *params = (p.strip() for p in media_range.split(";"))
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if content_type in by_content_type and quality > 0:
+            if content_type == "image/webp" and not HAS_PILLOW:
+                continue
+            accepted.append((-quality, i, by_content_type[content_type]))
+
+    return [image_format for _, _, image_format in sorted(accepted)]
+
+
+def negotiate_format(image_format: str, accept: str) -> str:
+    if image_format is None:
+        accepted = _accepted_formats(accept)
+        return accepted[0] if accepted else "png"
+
+    if image_format not in CONTENT_TYPES:
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{image_format}' is not a valid format.\n\n"
+                "Valid values are 'png', 'svg' or 'webp'.\n"
+                "If left empty, the Accept header is used, falling back to 'png'."
+            )
+        )
+    return image_format
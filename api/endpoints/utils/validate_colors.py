@@ -0,0 +1,15 @@
+from aiohttp import web
+
+
+def validate_colors(colors: str, image_format: str):
+    if colors is None:
+        return
+    if image_format != "png":
+        raise web.HTTPBadRequest(text="Colors is only valid for 'png'.")
+    if not colors.isdecimal() or not 2 <= int(colors) <= 256:
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{colors}' is not a valid colors value.\n\n"
+                "Valid values are 2 to 256 palette colors."
+            )
+        )
@@ -0,0 +1,15 @@
+from aiohttp import web
+
+
+def validate_compression(compression: str, image_format: str):
+    if compression is None:
+        return
+    if image_format != "png":
+        raise web.HTTPBadRequest(text="Compression is only valid for 'png'.")
+    if not compression.isdecimal() or int(compression) > 9:
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{compression}' is not a valid compression value.\n\n"
+                "Valid values are 0 (fastest) to 9 (smallest)."
+            )
+        )
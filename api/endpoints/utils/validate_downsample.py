@@ -0,0 +1,12 @@
+from aiohttp import web
+
+
+def validate_downsample(downsample: str):
+    if downsample not in ("true", "false"):
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{downsample}' is not a valid downsample value.\n\n"
+                "Valid values are 'true' or 'false'.\n"
+                "If left empty, 'true' will be used."
+            )
+        )
@@ -0,0 +1,13 @@
+from aiohttp import web
+
+from graphs import HAS_PILLOW, ImageOptions
+
+
+def validate_image_options(options: ImageOptions):
+    if options.needs_pillow and not HAS_PILLOW:
+        raise web.HTTPBadRequest(
+            text=(
+                "'webp', 'compression' and 'colors' are not available on this server.\n"
+                "Use 'png' or 'svg' without options instead."
+            )
+        )
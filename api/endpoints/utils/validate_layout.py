@@ -0,0 +1,24 @@
+import typing
+
+from aiohttp import web
+
+MAX_GRID_COUNTRIES = 36
+
+
+def validate_layout(
+    layout: str, since_case: typing.Optional[str], countries: typing.Sized
+):
+    if layout not in ("overlay", "grid"):
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{layout}' is not a valid layout value.\n\n"
+                "Valid values are 'overlay' or 'grid'.\n"
+                "If left empty, 'overlay' will be used."
+            )
+        )
+    if layout == "grid" and since_case is not None:
+        raise web.HTTPBadRequest(text="The 'grid' layout can't be used with 'since'.")
+    if layout == "grid" and len(countries) > MAX_GRID_COUNTRIES:
+        raise web.HTTPBadRequest(
+            text=f"The 'grid' layout supports at most {MAX_GRID_COUNTRIES} countries."
+        )
@@ -5,11 +5,27 @@ from aiohttp import web
 
 def validate_query_keys(query_keys: typing.Sequence[str]):
     for key in query_keys:
-        if key not in ("countries", "scale", "series", "since", "nonce"):
+        if key not in (
+            "by",
+            "colors",
+            "compression",
+            "countries",
+            "downsample",
+            "format",
+            "layout",
+            "scale",
+            "series",
+            "sharey",
+            "since",
+            "top",
+            "nonce",
+        ):
             raise web.HTTPBadRequest(
                 text=(
                     f"'{key}' is not a valid parameter.\n"
-                    "Valid parameters are none, one or many: 'countries', 'scale', 'series', and 'since'.\n"
+                    "Valid parameters are none, one or many: 'by', 'colors', "
+                    "'compression', 'countries', 'downsample', 'format', 'layout', "
+                    "'scale', 'series', 'sharey', 'since', and 'top'.\n"
                     "You can add an optional 'nonce' as a cache invalidation method."
                 )
             )
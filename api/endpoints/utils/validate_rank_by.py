@@ -0,0 +1,14 @@
+from aiohttp import web
+
+from country_day_data import RANKINGS
+
+
+def validate_rank_by(by: str):
+    if by not in RANKINGS:
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{by}' is not a valid by value.\n\n"
+                "Valid values are 'total', 'new' or 'new7'.\n"
+                "If left empty, 'total' will be used."
+            )
+        )
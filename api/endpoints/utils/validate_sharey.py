@@ -0,0 +1,12 @@
+from aiohttp import web
+
+
+def validate_sharey(sharey: str):
+    if sharey not in ("true", "false"):
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{sharey}' is not a valid sharey value.\n\n"
+                "Valid values are 'true' or 'false'.\n"
+                "If left empty, 'true' will be used."
+            )
+        )
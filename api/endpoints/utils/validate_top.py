@@ -0,0 +1,12 @@
+from aiohttp import web
+
+
+def validate_top(top: str):
+    if not top.isdecimal() or int(top) < 1:
+        raise web.HTTPBadRequest(
+            text=(
+                f"'{top}' is not a valid top value.\n\n"
+                "Top should be a positive whole number.\n"
+                "If left empty, 10 will be used."
+            )
+        )
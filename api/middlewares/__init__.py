@@ -0,0 +1,13 @@
+from .profiling import profiling_middleware
+from .server_timing import server_timing_middleware
+
+middlewares = (
+    server_timing_middleware,
+    profiling_middleware,
+)
+
+__all__ = (
+    "middlewares",
+    "profiling_middleware",
+    "server_timing_middleware",
+)
@@ -0,0 +1,88 @@
+import asyncio
+import cProfile
+import logging
+import pstats
+import typing
+from datetime import datetime
+from pathlib import Path
+
+from aiohttp import web
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+
+_profiling = False
+_profiled_first = False
+
+
+def _token_requested(request: web.Request) -> bool:
+    # A header rather than a query parameter, so the token stays out of the
+    # access log.
+    token = request.headers.get(PROFILE_TOKEN_HEADER)
+    if token is None:
+        return False
+
+    if not request.app["profile_token"] or token != request.app["profile_token"]:
+        raise web.HTTPForbidden(text="Invalid profile token.")
+    return True
+
+
+def _dump_profile(
+    path: str, profile_dir: str, profilers: typing.Sequence[cProfile.Profile]
+):
+    profile_dir = Path(profile_dir)
+    profile_dir.mkdir(parents=True, exist_ok=True)
+
+    stats = pstats.Stats(profilers[0])
+    for profiler in profilers[1:]:
+        stats.add(profiler)
+
+    name = "_".join(
+        [
+            datetime.utcnow().strftime("%Y%m%dT%H%M%S%f"),
+            path.strip("/").replace("/", "_") or "index",
+        ]
+    )
+    profile_path = profile_dir / f"{name}.prof"
+    stats.dump_stats(profile_path)
+    logging.info("Wrote profile for %s to %s", path, profile_path)
+
+
+@web.middleware
+async def profiling_middleware(
+    request: web.Request, handler: typing.Callable
+) -> web.StreamResponse:
+    global _profiling, _profiled_first
+
+    requested = _token_requested(request)
+
+    # Only one request is profiled at a time; the event loop profiler would
+    # otherwise record the work of every other profiled request as well.
+    if _profiling:
+        return await handler(request)
+    if not requested:
+        if not request.app["profile_first"] or _profiled_first:
+            return await handler(request)
+        _profiled_first = True
+
+    timings = request["timings"]
+    timings.profile = True
+    profiler = cProfile.Profile()
+    timings.profilers.append(profiler)
+
+    _profiling = True
+    profiler.enable()
+    try:
+        return await handler(request)
+    finally:
+        profiler.disable()
+        _profiling = False
+        try:
+            await asyncio.get_event_loop().run_in_executor(
+                None,
+                _dump_profile,
+                request.path,
+                request.app["profile_dir"],
+                timings.profilers,
+            )
+        except Exception:
+            logging.exception("Writing the profile for %s failed", request.path)
@@ -0,0 +1,26 @@
+import typing
+from time import perf_counter
+
+from aiohttp import web
+
+from utils import Timings
+
+
+@web.middleware
+async def server_timing_middleware(
+    request: web.Request, handler: typing.Callable
+) -> web.StreamResponse:
+    timings = Timings()
+    request["timings"] = timings
+    start = perf_counter()
+
+    try:
+        response = await handler(request)
+    except web.HTTPException as e:
+        timings.record("total", perf_counter() - start)
+        e.headers["Server-Timing"] = timings.server_timing()
+        raise
+
+    timings.record("total", perf_counter() - start)
+    response.headers["Server-Timing"] = timings.server_timing()
+    return response
@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import typing
+
+from aiohttp import ClientSession
+
+from scraper import initialize_data
+from utils import publish_data
+
+
+class WorkerPool:
+    def __init__(
+        self,
+        worker_main: typing.Callable[[socket.socket, str], None],
+        workers: int,
+        data_dir: str,
+        backfill_dir: typing.Optional[str] = None,
+    ):
+        self.worker_main = worker_main
+        self.workers = workers
+        self.data_dir = data_dir
+        self.backfill_dir = backfill_dir
+        self.processes: typing.List[multiprocessing.Process] = []
+        self.refreshing = False
+        # Spawned rather than forked, so workers never inherit the event loop.
+        self.context = multiprocessing.get_context("spawn")
+
+    async def refresh(self):
+        async with ClientSession() as session:
+            data = await initialize_data(session, self.backfill_dir)
+
+        version = publish_data(self.data_dir, data)
+        logging.info("Published data version %s", version)
+
+    async def refresh_and_notify(self):
+        if self.refreshing:
+            logging.info("Refresh already in progress")
+            return
+
+        self.refreshing = True
+        try:
+            await self.refresh()
+        except Exception:
+            logging.exception("Refreshing data failed")
+            return
+        finally:
+            self.refreshing = False
+
+        for process in self.processes:
+            if process.is_alive():
+                os.kill(process.pid, signal.SIGHUP)
+
+    def start_worker(self, sock: socket.socket) -> multiprocessing.Process:
+        process = self.context.Process(
+            target=self.worker_main, args=(sock, self.data_dir)
+        )
+        # Ignored signals survive exec, so a refresh notification sent while
+        # the worker is still importing can't kill it.
+        previous = signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        try:
+            process.start()
+        finally:
+            signal.signal(signal.SIGHUP, previous)
+        return process
+
+    async def supervise(self, sock: socket.socket):
+        while True:
+            await asyncio.sleep(1)
+            for i, process in enumerate(self.processes):
+                if not process.is_alive():
+                    logging.warning(
+                        "Worker %s exited with %s, restarting",
+                        process.pid,
+                        process.exitcode,
+                    )
+                    self.processes[i] = self.start_worker(sock)
+
+    def run(self, host: str = "0.0.0.0", port: int = 8080):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind((host, port))
+        sock.listen(128)
+
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.refresh())
+
+        self.processes = [self.start_worker(sock) for _ in range(self.workers)]
+        loop.add_signal_handler(
+            signal.SIGUSR1, lambda: loop.create_task(self.refresh_and_notify())
+        )
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, loop.stop)
+
+        supervisor = loop.create_task(self.supervise(sock))
+        try:
+            loop.run_forever()
+        finally:
+            supervisor.cancel()
+            loop.run_until_complete(asyncio.gather(supervisor, return_exceptions=True))
+            for process in self.processes:
+                process.terminate()
+            for process in self.processes:
+                process.join()
+            sock.close()
+            loop.close()
@@ -1,29 +1,63 @@
 import logging
+import os
+import signal
+import socket
+import typing
 
 from aiohttp import web
-from matplotlib import pyplot as plt
 
 from api.endpoints.routes import add_routes
-from utils import init_startup
+from api.middlewares import middlewares
+from api.workers import WorkerPool
+from graphs import preload_pyplot
+from utils import RenderCache, init_startup
 
+ACCESS_LOG_FORMAT = '%a %t "%r" %s %b %Tf "%{Referer}i" "%{User-Agent}i"'
 
-async def init_app() -> web.Application:
-    app = web.Application()
+
+async def init_app(shared_data_dir: typing.Optional[str] = None) -> web.Application:
+    app = web.Application(middlewares=middlewares)
     logging.basicConfig(level=logging.INFO)
 
+    app["profile_first"] = os.environ.get("COVID19_PROFILE_FIRST") == "1"
+    app["profile_token"] = os.environ.get("COVID19_PROFILE_TOKEN")
+    app["profile_dir"] = os.environ.get("COVID19_PROFILE_DIR", "profiles")
+    app["backfill_dir"] = os.environ.get("COVID19_BACKFILL_DIR")
+    app["shared_data_dir"] = shared_data_dir
+    app["render_cache"] = RenderCache(
+        int(os.environ.get("COVID19_RENDER_CACHE_SIZE", "128"))
+    )
+
     add_routes(app)
     init_startup(app)
+    app.on_startup.append(preload_pyplot)
 
     return app
 
 
-def main():
-    plt.style.use("discord.mplstyle")
+def worker_main(sock: socket.socket, shared_data_dir: str):
+    # SIGHUP means a new data version; until the app maps the data on startup
+    # it can be ignored, as startup always maps the current version.
+    signal.signal(signal.SIGHUP, signal.SIG_IGN)
     web.run_app(
-        init_app(),
-        access_log_format='%a %t "%r" %s %b %Tf "%{Referer}i" "%{User-Agent}i"',
+        init_app(shared_data_dir), sock=sock, access_log_format=ACCESS_LOG_FORMAT
     )
 
 
+def main():
+    workers = int(os.environ.get("COVID19_WORKERS", "1"))
+    if workers > 1:
+        logging.basicConfig(level=logging.INFO)
+        WorkerPool(
+            worker_main,
+            workers,
+            os.environ.get("COVID19_DATA_DIR", "shared_data"),
+            os.environ.get("COVID19_BACKFILL_DIR"),
+        ).run()
+        return
+
+    web.run_app(init_app(), access_log_format=ACCESS_LOG_FORMAT)
+
+
 if __name__ == "__main__":
     main()
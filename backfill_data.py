@@ -0,0 +1,34 @@
+import asyncio
+from argparse import ArgumentParser
+from pathlib import Path
+
+from aiohttp import ClientSession, TCPConnector
+
+from scraper import backfill_daily_reports, build_region_index
+from scraper.backfill import DAILY_REPORTS_URL
+
+
+async def _main():
+    parser = ArgumentParser(
+        description="Download the CSSE daily reports into a local cache."
+    )
+    parser.add_argument("cache_dir", type=Path)
+    parser.add_argument(
+        "--source",
+        default=DAILY_REPORTS_URL,
+        help="Base URL or local directory containing MM-DD-YYYY.csv files.",
+    )
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    async with ClientSession(connector=TCPConnector(limit=args.concurrency)) as session:
+        reports = await backfill_daily_reports(
+            session, args.cache_dir, args.source, args.concurrency
+        )
+
+    index = build_region_index([], reports)
+    print(f"{len(reports)} reports, {len(index)} series, {len(index.days)} days")
+
+
+if __name__ == "__main__":
+    asyncio.get_event_loop().run_until_complete(_main())
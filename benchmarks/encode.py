@@ -0,0 +1,50 @@
+from time import perf_counter
+
+from graphs import HAS_PILLOW, ImageOptions
+from graphs.graph import _graph
+from utils import Timings
+
+from .render import synthetic_axes
+
+SERIES_LENGTH = 365
+REPEAT = 5
+
+VARIANTS = [
+    ("png", ImageOptions()),
+    ("svg", ImageOptions("svg")),
+]
+if HAS_PILLOW:
+    VARIANTS += [
+        ("png compression=1", ImageOptions(compression=1)),
+        ("png compression=9", ImageOptions(compression=9)),
+        ("png colors=256", ImageOptions(colors=256)),
+        ("png colors=64", ImageOptions(colors=64)),
+        ("webp", ImageOptions("webp")),
+    ]
+
+
+def encode(axes: list, options: ImageOptions):
+    best_encode = best_total = float("inf")
+    for _ in range(REPEAT):
+        timings = Timings()
+        start = perf_counter()
+        image = _graph(axes, "Confirmed Cases", "linear", True, options, timings)
+        best_total = min(best_total, perf_counter() - start)
+        best_encode = min(best_encode, dict(timings.stages)["encode"])
+    return best_encode, best_total, len(image.getvalue())
+
+
+def main():
+    axes = synthetic_axes(SERIES_LENGTH)
+    print(f"{len(axes)} series of {SERIES_LENGTH} points, best of {REPEAT}")
+    print(f"{'variant':<20} {'encode ms':>10} {'total ms':>9} {'bytes':>8}")
+    for name, options in VARIANTS:
+        encode_time, total_time, size = encode(axes, options)
+        print(
+            f"{name:<20} {encode_time * 1000:>10.1f} {total_time * 1000:>9.1f} "
+            f"{size:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import typing
+from time import perf_counter
+
+import numpy as np
+
+from graphs import ImageOptions
+from graphs.graph import _graph
+from utils import Timings
+
+SERIES_LENGTHS = (100, 365, 730, 1460, 2920)
+COUNTRIES = 5
+REPEAT = 5
+
+
+def synthetic_axes(length: int) -> typing.List[tuple]:
+    days = np.arange(np.datetime64("2020-01-22"), np.datetime64("2020-01-22") + length)
+    rng = np.random.default_rng(0)
+    return [
+        (
+            None,
+            f"Country {i}",
+            (days, np.cumsum(rng.integers(0, 1000 * (i + 1), length)) + 1),
+        )
+        for i in range(COUNTRIES)
+    ]
+
+
+def render_time(axes: typing.List[tuple], downsample: bool) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = perf_counter()
+        _graph(axes, "Confirmed Cases", "linear", downsample, ImageOptions(), Timings())
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def main():
+    print(f"{COUNTRIES} series each, best of {REPEAT} (ms)")
+    print(f"{'points':>8} {'full':>10} {'downsampled':>12} {'speedup':>8}")
+    for length in SERIES_LENGTHS:
+        axes = synthetic_axes(length)
+        full = render_time(axes, False)
+        downsampled = render_time(axes, True)
+        print(
+            f"{length:>8} {full * 1000:>10.1f} {downsampled * 1000:>12.1f} "
+            f"{full / downsampled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
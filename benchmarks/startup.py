@@ -0,0 +1,112 @@
+import asyncio
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import date, datetime, timedelta, timezone
+from time import perf_counter
+
+from aiohttp import ClientError, ClientSession
+
+HEAVY_MODULES = ("matplotlib", "pycountry", "numpy", "PIL")
+PORT = 18081
+
+
+def import_time(module: str) -> str:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        return f"{module}: import failed"
+
+    lines = result.stderr.splitlines()
+    total = int(lines[-1].split("|")[1])
+    heavy = [
+        m
+        for m in HEAVY_MODULES
+        if any(line.split("|")[2].strip() == m for line in lines[1:])
+    ]
+    return (
+        f"{module}: {total / 1000:.0f} ms, heavy modules: {', '.join(heavy) or 'none'}"
+    )
+
+
+def serve():
+    # Serve synthetic data so startup is measured without the CSSE download.
+    from aiohttp import web
+
+    import api_main
+    from countries import get_country
+    from country_day_data import CountryDayData
+    from scraper import build_region_index
+    from utils import update_data
+
+    async def synthetic_data(app: web.Application):
+        now = datetime.now(timezone.utc)
+        app["data"] = build_region_index(
+            [
+                CountryDayData(
+                    date(2020, 1, 22) + timedelta(i),
+                    get_country(code),
+                    "",
+                    now,
+                    i * i,
+                    i,
+                    0,
+                )
+                for code in ("ZAF", "USA", "ITA")
+                for i in range(365)
+            ]
+        )
+
+    async def init_app() -> web.Application:
+        app = await api_main.init_app()
+        app.on_startup[:] = [
+            synthetic_data if handler is update_data else handler
+            for handler in app.on_startup
+        ]
+        return app
+
+    web.run_app(init_app(), port=PORT, print=None, access_log=None)
+
+
+async def time_to_first_request() -> str:
+    start = perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.startup", "--serve"])
+    out = []
+    try:
+        async with ClientSession() as session:
+            for path in ("/data?countries=ZA", "/graph?countries=ZA"):
+                while True:
+                    try:
+                        async with session.get(
+                            f"http://127.0.0.1:{PORT}{path}"
+                        ) as resp:
+                            await resp.read()
+                            if resp.status == 200:
+                                break
+                    except ClientError:
+                        pass
+                    await asyncio.sleep(0.01)
+                out.append(f"{path}: {(perf_counter() - start) * 1000:.0f} ms")
+    finally:
+        process.terminate()
+        process.wait()
+    return "time to first " + ", ".join(out)
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--serve", action="store_true")
+    if parser.parse_args().serve:
+        serve()
+        return
+
+    for module in ("api_main", "discord_main"):
+        print(import_time(module))
+    print(asyncio.get_event_loop().run_until_complete(time_to_first_request()))
+
+
+if __name__ == "__main__":
+    main()
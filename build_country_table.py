@@ -0,0 +1,5 @@
+from countries import COUNTRY_TABLE, write_country_table
+
+if __name__ == "__main__":
+    write_country_table()
+    print(f"Wrote {COUNTRY_TABLE}")
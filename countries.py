@@ -0,0 +1,165 @@
+import json
+import typing
+from pathlib import Path
+
+COUNTRY_TABLE = Path(__file__).with_name("country_table.json")
+
+# Names used by the CSSE daily reports, which carry no ISO3 column.
+COUNTRY_ALIASES = {
+    "Bahamas, The": "BHS",
+    "Bolivia": "BOL",
+    "Brunei": "BRN",
+    "Burma": "MMR",
+    "Cape Verde": "CPV",
+    "Congo (Brazzaville)": "COG",
+    "Congo (Kinshasa)": "COD",
+    "Cote d'Ivoire": "CIV",
+    "Cruise Ship": "Diamond Princess",
+    "East Timor": "TLS",
+    "Gambia, The": "GMB",
+    "Holy See": "VAT",
+    "Hong Kong SAR": "HKG",
+    "Iran": "IRN",
+    "Iran (Islamic Republic of)": "IRN",
+    "Ivory Coast": "CIV",
+    "Korea, South": "KOR",
+    "Kosovo": "XKS",
+    "Laos": "LAO",
+    "Macao SAR": "MAC",
+    "Macau": "MAC",
+    "Mainland China": "CHN",
+    "Micronesia": "FSM",
+    "Moldova": "MDA",
+    "North Ireland": "GBR",
+    "occupied Palestinian territory": "PSE",
+    "Others": "Diamond Princess",
+    "Palestine": "PSE",
+    "Republic of Ireland": "IRL",
+    "Republic of Korea": "KOR",
+    "Republic of Moldova": "MDA",
+    "Russia": "RUS",
+    "Russian Federation": "RUS",
+    "South Korea": "KOR",
+    "Syria": "SYR",
+    "Taiwan*": "TWN",
+    "Tanzania": "TZA",
+    "The Bahamas": "BHS",
+    "The Gambia": "GMB",
+    "UK": "GBR",
+    "US": "USA",
+    "Vatican City": "VAT",
+    "Venezuela": "VEN",
+    "Viet Nam": "VNM",
+    "Vietnam": "VNM",
+    "West Bank and Gaza": "PSE",
+}
+_LOWER_COUNTRY_ALIASES = {k.lower(): v for k, v in COUNTRY_ALIASES.items()}
+
+
+class Country(typing.NamedTuple):
+    name: str
+    alpha_2: str
+    alpha_3: str
+
+
+class _Table(typing.NamedTuple):
+    countries: typing.List[Country]
+    by_alpha_3: typing.Dict[str, Country]
+    by_key: typing.Dict[str, Country]
+    names: typing.List[typing.Tuple[str, Country]]
+
+
+_table: typing.Optional[_Table] = None
+
+
+def write_country_table(path: Path = COUNTRY_TABLE):
+    # pycountry is only needed to build the table, never at runtime.
+    import pycountry
+
+    rows = [
+        [
+            country.alpha_2,
+            country.alpha_3,
+            country.name,
+            getattr(country, "official_name", None),
+            getattr(country, "common_name", None),
+        ]
+        for country in pycountry.countries
+    ]
+    path.write_text(json.dumps(rows, separators=(",", ":")))
+
+
+def _load_table() -> _Table:
+    global _table
+    if _table is not None:
+        return _table
+
+    if not COUNTRY_TABLE.exists():
+        raise FileNotFoundError(
+            f"{COUNTRY_TABLE} is missing, run build_country_table.py to build it."
+        )
+
+    countries = []
+    by_key = {}
+    names = []
+    for alpha_2, alpha_3, name, official_name, common_name in json.loads(
+        COUNTRY_TABLE.read_text()
+    ):
+        country = Country(name, alpha_2, alpha_3)
+        countries.append(country)
+        for key in (alpha_2, alpha_3, name, official_name, common_name):
+            if key:
+                by_key.setdefault(key.lower(), country)
+        for key in (name, official_name, common_name):
+            if key:
+                names.append((key.lower(), country))
+
+    _table = _Table(countries, {c.alpha_3: c for c in countries}, by_key, names)
+    return _table
+
+
+def get_country(alpha_3: str) -> typing.Optional[Country]:
+    return _load_table().by_alpha_3.get(alpha_3)
+
+
+def lookup_country(search: str) -> Country:
+    country = _load_table().by_key.get(search.lower())
+    if country is None:
+        raise LookupError(search)
+    return country
+
+
+def search_countries(search: str) -> typing.List[Country]:
+    search = search.lower()
+    try:
+        return [lookup_country(search)]
+    except LookupError:
+        pass
+
+    # Partial name matches, earlier matches scoring higher, as pycountry does.
+    scores = {}
+    for name, country in _load_table().names:
+        index = name.find(search)
+        if index != -1:
+            scores[country] = max(scores.get(country, 0), max(10 - index, 5))
+    if not scores:
+        raise LookupError(search)
+    return sorted(scores, key=lambda c: -scores[c])
+
+
+def country_to_identifier(search: str) -> str:
+    search = _LOWER_COUNTRY_ALIASES.get(search.lower(), search)
+    try:
+        return search_countries(search)[0].alpha_3
+    except LookupError:
+        return search.replace(" ", "_").upper()
+
+
+def region_identifier(country_identifier: str, province_state: str) -> str:
+    return f"{country_identifier}-{province_state.replace(' ', '_').upper()}"
+
+
+def region_to_identifier(search: str) -> str:
+    country, separator, province_state = search.partition("/")
+    identifier = country_to_identifier(country)
+    return region_identifier(identifier, province_state) if separator else identifier
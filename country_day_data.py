@@ -1,49 +1,92 @@
 import typing
+from collections.abc import Mapping
 from dataclasses import dataclass
-from datetime import date, datetime, timezone
+from datetime import date, datetime, timedelta, timezone
+from functools import cached_property
 
-import pycountry
+import numpy as np
 from aiohttp import web
 
+from countries import (
+    COUNTRY_ALIASES,
+    Country,
+    get_country,
+    lookup_country,
+    region_to_identifier,
+)
+
+SERIES = ("confirmed", "deaths", "recovered")
+
+# Latest total, new over the last day, and new over the last seven days.
+RANKINGS = ("total", "new", "new7")
+
 FOUND_COUNTRIES = {}
 
+# (country, province/state) keys of every DailyReport, so reports of different
+# days share the key objects instead of each holding copies.
+REPORT_KEYS = {}
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+LAST_UPDATE_FORMATS = (
+    "%m/%d/%y",
+    "%m/%d/%Y",
+    "%m/%d/%y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%m/%d/%y %H:%M:%S",
+    "%m/%d/%Y %H:%M:%S",
+)
+
 
 def parse_last_update(last_update: str) -> datetime:
     try:
-        out = datetime.fromisoformat(last_update)
+        out = datetime.fromisoformat(last_update.rstrip("Z"))
     except ValueError:
-        out = datetime.strptime(last_update, "%m/%d/%y")
+        for last_update_format in LAST_UPDATE_FORMATS:
+            try:
+                out = datetime.strptime(last_update, last_update_format)
+                break
+            except ValueError:
+                pass
+        else:
+            raise ValueError(f"Unknown Last_Update format: {last_update!r}")
 
     return out.replace(tzinfo=timezone.utc)
 
 
-def find_country(iso3: str, country_region: str) -> pycountry.ExistingCountries:
-    iso3_or_country = iso3 or country_region
+def find_country(iso3: str, country_region: str) -> Country:
+    iso3_or_country = iso3 or COUNTRY_ALIASES.get(country_region, country_region)
 
     if iso3_or_country == "XKS":
-        return pycountry.db.Data(name="Kosovo", alpha_2="XK", alpha_3="XKS")
+        return Country(name="Kosovo", alpha_2="XK", alpha_3="XKS")
     if iso3_or_country == "Diamond Princess":
-        return pycountry.db.Data(
+        return Country(
             name="Diamond Princess",
             alpha_2="DIAMOND_PRINCESS",
             alpha_3="DIAMOND_PRINCESS",
         )
     if iso3_or_country == "MS Zaandam":
-        return pycountry.db.Data(
-            name="MS Zaandam", alpha_2="MS_ZAANDAM", alpha_3="MS_ZAANDAM"
-        )
-    if iso3:
-        country = pycountry.countries.get(alpha_3=iso3)
-        if country:
-            return country
-    print(iso3, country_region)
+        return Country(name="MS Zaandam", alpha_2="MS_ZAANDAM", alpha_3="MS_ZAANDAM")
+    if iso3_or_country in FOUND_COUNTRIES:
+        return FOUND_COUNTRIES[iso3_or_country]
+
+    country = get_country(iso3_or_country)
+    if country is None and not iso3:
+        try:
+            country = lookup_country(country_region)
+        except LookupError:
+            pass
+    if country:
+        FOUND_COUNTRIES[iso3_or_country] = country
+        return country
     raise KeyError()
 
 
 @dataclass(frozen=True)
 class CountryDayData:
     day: date
-    country: pycountry.ExistingCountries
+    country: Country
+    province_state: str
     last_update: datetime
     confirmed: int
     deaths: int
@@ -58,6 +101,7 @@ class CountryDayData:
             find_country(
                 data.get("iso3", data.get("ISO3")) or None, data["Country_Region"]
             ),
+            data.get("Province_State") or "",
             last_update,
             int(data["Confirmed"] or 0),
             int(data["Deaths"] or 0),
@@ -90,73 +134,251 @@ class DayData:
         )
 
 
-@dataclass
 class CountryData:
-    country: pycountry.ExistingCountries
-    identifier: str
-    last_update: datetime
-    days: typing.List[DayData]
-
     def __init__(
         self,
-        country: pycountry.ExistingCountries,
+        country: Country,
+        identifier: str,
+        parent: typing.Optional[str],
         last_update: datetime,
-        days: typing.List[DayData],
+        days: np.ndarray,
+        values: np.ndarray,
     ):
         self.country = country
-        self.identifier = self.country.alpha_3
+        self.identifier = identifier
+        self.parent = parent
         self.last_update = last_update
         self.days = days
+        self.values = values
 
     def to_dict_without_days(self) -> dict:
         return {
             "country_region": self.country.name,
             "identifier": self.identifier,
+            "parent": self.parent,
             "last_update": self.last_update.isoformat(),
         }
 
     def to_dict(self) -> dict:
         return {
-            "country_region": self.country.name,
-            "identifier": self.identifier,
-            "last_update": self.last_update.isoformat(),
-            "days": [day.to_dict() for day in self.days],
+            **self.to_dict_without_days(),
+            "days": [
+                DayData(day.item(), *(int(v) for v in values)).to_dict()
+                for day, values in zip(self.days, self.values.T)
+            ],
         }
 
-    def confirmed_days(self) -> typing.List[date]:
-        return [d.day for d in self.days if d.confirmed > 0]
+    def series_axes(self, series: str) -> typing.Tuple[np.ndarray, np.ndarray]:
+        values = self.values[SERIES.index(series)]
+        mask = values > 0
+        return self.days[mask], values[mask]
 
-    def confirmed_cases(self) -> typing.List[int]:
-        return [d.confirmed for d in self.days if d.confirmed > 0]
+    def confirmed_days(self) -> np.ndarray:
+        return self.series_axes("confirmed")[0]
 
-    def deaths_days(self) -> typing.List[date]:
-        return [d.day for d in self.days if d.deaths > 0]
+    def confirmed_cases(self) -> np.ndarray:
+        return self.series_axes("confirmed")[1]
 
-    def deaths_cases(self) -> typing.List[str]:
-        return [d.deaths for d in self.days if d.deaths > 0]
+    def deaths_days(self) -> np.ndarray:
+        return self.series_axes("deaths")[0]
 
-    def confirmed_axes(self) -> typing.Tuple[str, typing.List[date], typing.List[int]]:
-        return self.confirmed_days(), self.confirmed_cases()
+    def deaths_cases(self) -> np.ndarray:
+        return self.series_axes("deaths")[1]
 
-    def deaths_axes(self) -> typing.Tuple[str, typing.List[date], typing.List[int]]:
-        return self.deaths_days(), self.deaths_cases()
+    def confirmed_axes(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        return self.series_axes("confirmed")
+
+    def deaths_axes(self) -> typing.Tuple[np.ndarray, np.ndarray]:
+        return self.series_axes("deaths")
+
+
+# All series of every node share one (node, series, day) matrix over a common
+# day axis, and each CountryData is a view into its row.
+class RegionIndex(Mapping):
+    def __init__(
+        self,
+        days: np.ndarray,
+        values: np.ndarray,
+        nodes: typing.Sequence[
+            typing.Tuple[Country, str, typing.Optional[str], datetime]
+        ],
+    ):
+        self.days = days
+        self.values = values
+        self.positions = {}
+        self.identifiers = []
+        self.children = {}
+        self.nodes = {}
+
+        for i, (country, identifier, parent, last_update) in enumerate(nodes):
+            self.positions[identifier] = i
+            self.identifiers.append(identifier)
+            self.nodes[identifier] = CountryData(
+                country, identifier, parent, last_update, days, values[i]
+            )
+            if parent is not None:
+                self.children.setdefault(parent, []).append(identifier)
+
+    def __contains__(self, identifier: str) -> bool:
+        return identifier in self.nodes
+
+    def __getitem__(self, identifier: str) -> CountryData:
+        return self.nodes[identifier]
+
+    def __iter__(self) -> typing.Iterator[str]:
+        return iter(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    @cached_property
+    def rankings(self) -> typing.Dict[typing.Tuple[str, str], np.ndarray]:
+        # Only countries are ranked.
+        countries = np.array(
+            [self.positions[c] for c in self.children.get("GLOBAL", [])], dtype=np.intp
+        )
+        values = self.values[countries]
+        latest = values[:, :, -1]
+        metrics = np.stack(
+            [
+                latest,
+                latest - values[:, :, max(len(self.days) - 2, 0)],
+                latest - values[:, :, max(len(self.days) - 8, 0)],
+            ]
+        )
+        order = np.argsort(-metrics, axis=1, kind="stable")
+        ranked = np.take_along_axis(metrics, order, axis=1)
+
+        return {
+            (series, by): np.stack([countries[order[i, :, j]], ranked[i, :, j]])
+            for i, by in enumerate(RANKINGS)
+            for j, series in enumerate(SERIES)
+        }
+
+    def top(
+        self, series: str, by: str, count: int
+    ) -> typing.List[typing.Tuple[CountryData, int]]:
+        positions, values = self.rankings[(series, by)][:, :count]
+        return [
+            (self.nodes[self.identifiers[position]], int(value))
+            for position, value in zip(positions, values)
+        ]
+
+    def to_metadata(self) -> dict:
+        return {
+            "first_day": str(self.days[0]),
+            "nodes": [
+                {
+                    "name": node.country.name,
+                    "alpha_2": node.country.alpha_2,
+                    "alpha_3": node.country.alpha_3,
+                    "identifier": node.identifier,
+                    "parent": node.parent,
+                    "last_update": node.last_update.isoformat(),
+                }
+                for node in self.nodes.values()
+            ],
+        }
+
+    @classmethod
+    def from_metadata(cls, metadata: dict, values: np.ndarray):
+        first_day = np.datetime64(metadata["first_day"], "D")
+        return cls(
+            np.arange(first_day, first_day + values.shape[2]),
+            values,
+            [
+                (
+                    Country(
+                        name=node["name"],
+                        alpha_2=node["alpha_2"],
+                        alpha_3=node["alpha_3"],
+                    ),
+                    node["identifier"],
+                    node["parent"],
+                    datetime.fromisoformat(node["last_update"]),
+                )
+                for node in metadata["nodes"]
+            ],
+        )
 
 
 CountryDayDataList = typing.List[CountryDayData]
 CountryDataList = typing.List[CountryData]
 
 
-def country_to_identifier(search: str):
-    try:
-        pyc = pycountry.countries.search_fuzzy(search)
-        return pyc[0].alpha_3
-    except LookupError:
-        return search.replace(" ", "_").upper()
+class DailyReport(typing.NamedTuple):
+    # A day of counts per (country, province/state) key, kept as arrays so
+    # cached reports stay small and can be copied into a RegionIndex at once.
+    day: date
+    keys: typing.Tuple[typing.Tuple[Country, str], ...]
+    last_updates: np.ndarray
+    counts: np.ndarray
+
+    @classmethod
+    def from_rows(cls, day: date, rows: typing.Iterable[CountryDayData]):
+        # Keep the most recent row of each key; the historical and current
+        # files can both cover today.
+        latest = {}
+        for row in rows:
+            identity = (row.country.alpha_3, row.province_state)
+            if identity not in latest or latest[identity].last_update < row.last_update:
+                latest[identity] = row
+
+        return cls(
+            day,
+            tuple(
+                REPORT_KEYS.setdefault(key, key)
+                for key in (
+                    (row.country, row.province_state) for row in latest.values()
+                )
+            ),
+            np.array(
+                [
+                    (row.last_update - EPOCH) // timedelta(microseconds=1)
+                    for row in latest.values()
+                ],
+                dtype=np.int64,
+            ),
+            np.array(
+                [(row.confirmed, row.deaths, row.recovered) for row in latest.values()],
+                dtype=np.int32,
+            ).reshape(-1, len(SERIES)),
+        )
 
 
-def filter_countries(data: CountryDataList, country_names: typing.Sequence[str]):
+def daily_reports(data: CountryDayDataList) -> typing.List[DailyReport]:
+    days = {}
+    for row in data:
+        days.setdefault(row.day, []).append(row)
+    return [DailyReport.from_rows(day, rows) for day, rows in days.items()]
+
+
+def filter_countries(data: RegionIndex, country_names: typing.Sequence[str]):
+    def find_top(cn: str):
+        _, count, *ranking = cn.lower().split(":")
+        series = ranking[0] if ranking else "confirmed"
+        by = ranking[1] if len(ranking) > 1 else "total"
+        if (
+            not count.isdecimal()
+            or int(count) < 1
+            or len(ranking) > 2
+            or series not in ("confirmed", "deaths")
+            or by not in RANKINGS
+        ):
+            raise web.HTTPBadRequest(
+                text=(
+                    f"{cn} is not a valid ranking.\n\n"
+                    "Use 'top:<count>:<series>:<by>', e.g. 'top:10:deaths:new7'.\n"
+                    "Series is 'confirmed' or 'deaths', and defaults to 'confirmed'.\n"
+                    "By is 'total', 'new' or 'new7', and defaults to 'total'."
+                )
+            )
+        return [country for country, _ in data.top(series, by, int(count))]
+
     def find_one(cn: str):
-        identifier = country_to_identifier(cn)
+        identifier = cn.upper()
+        if identifier not in data:
+            identifier = region_to_identifier(cn)
         if identifier in data:
             return data[identifier]
         raise web.HTTPBadRequest(
@@ -165,9 +387,17 @@ def filter_countries(data: CountryDataList, country_names: typing.Sequence[str])
                 "You can use none, one or many country codes or names.\n"
                 "If left empty, 'global' will be used.\n"
                 "Both Alpha-2 and Alpha-3 country codes will work.\n"
-                "Prefer country codes to names.\n\n"
+                "Prefer country codes to names.\n"
+                "Use 'Country/Province' for a province or state, e.g. 'US/New York'.\n"
+                "Use 'top:10:deaths' for the 10 countries with the most deaths.\n\n"
                 "Special names: 'Global', 'Diamond Princess', and 'MS Zaandam'"
             )
         )
 
-    return [find_one(cn) for cn in country_names]
+    return [
+        country
+        for cn in country_names
+        for country in (
+            find_top(cn) if cn.lower().startswith("top:") else [find_one(cn)]
+        )
+    ]
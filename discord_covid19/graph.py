@@ -5,7 +5,7 @@ from time import time_ns
 import discord
 from aiohttp import ClientSession
 
-from country_day_data import country_to_identifier
+from countries import region_to_identifier
 
 
 def group_args(args: typing.Sequence[str]) -> typing.Dict[str, typing.List[str]]:
@@ -14,7 +14,7 @@ def group_args(args: typing.Sequence[str]) -> typing.Dict[str, typing.List[str]]
     current_array = []
 
     for arg in args:
-        if arg in ("countries", "scale", "series", "since"):
+        if arg in ("countries", "downsample", "scale", "series", "since"):
             if key is not None and current_array:
                 out[key] = current_array
             key = arg
@@ -32,7 +32,14 @@ def parse_args(args: typing.Sequence[str]) -> typing.Dict[str, str]:
     grouped_args = group_args(args)
     if "countries" in grouped_args:
         grouped_args["countries"] = ",".join(
-            [country_to_identifier(country) for country in grouped_args["countries"]]
+            [
+                (
+                    country
+                    if country.lower().startswith("top:")
+                    else region_to_identifier(country)
+                )
+                for country in grouped_args["countries"]
+            ]
         )
 
     if "scale" in grouped_args:
@@ -40,6 +47,11 @@ def parse_args(args: typing.Sequence[str]) -> typing.Dict[str, str]:
             raise ValueError("Scale should have exactly 1 value.")
         grouped_args["scale"] = grouped_args["scale"][0]
 
+    if "downsample" in grouped_args:
+        if len(grouped_args["downsample"]) != 1:
+            raise ValueError("Downsample should have exactly 1 value.")
+        grouped_args["downsample"] = grouped_args["downsample"][0]
+
     if "series" in grouped_args:
         grouped_args["series"] = ",".join(grouped_args["series"])
 
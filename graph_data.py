@@ -3,7 +3,6 @@ from pathlib import Path
 from sys import argv
 
 from aiohttp import ClientSession
-from matplotlib import pyplot as plt
 
 from country_day_data import filter_countries
 from graphs import graph, graph_since_nth_case
@@ -16,8 +15,6 @@ async def _main():
     async with ClientSession() as session:
         data = await initialize_data(session)
 
-    plt.style.use("discord.mplstyle")
-
     cz_za_countries = filter_countries(data, ["CZ", "ZA"])
     us_za_countries = filter_countries(data, ["US", "ZA"])
     since_0_countries = filter_countries(data, ["ZA", "Italy", "KR", "CZ", "US"])
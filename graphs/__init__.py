@@ -1,7 +1,15 @@
 from .graph import graph
+from .graph_grid import graph_grid
 from .graph_since_nth_case import graph_since_nth_case
+from .pyplot import preload_pyplot
+from .render import CONTENT_TYPES, HAS_PILLOW, ImageOptions
 
 __all__ = (
+    "CONTENT_TYPES",
     "graph",
+    "graph_grid",
     "graph_since_nth_case",
+    "HAS_PILLOW",
+    "ImageOptions",
+    "preload_pyplot",
 )
@@ -0,0 +1,74 @@
+import math
+import typing
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from matplotlib.axes import Axes
+
+# Above this many points markers are only drawn on every n-th point.
+MAX_MARKERS = 40
+
+
+def _as_float(values: typing.Sequence) -> np.ndarray:
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        values = values.astype("datetime64[D]").astype(np.int64)
+    return values.astype(np.float64)
+
+
+def lttb(
+    x: typing.Sequence, y: typing.Sequence, threshold: int, log: bool = False
+) -> typing.Tuple[np.ndarray, np.ndarray]:
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    xs = _as_float(x)
+    ys = np.log10(_as_float(y)) if log else _as_float(y)
+
+    # Largest-Triangle-Three-Buckets: keep the first and last points, and from
+    # each bucket in between the point forming the largest triangle with the
+    # previously kept point and the average of the next bucket.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(np.append(edges, n))
+    avg_xs = (np.add.reduceat(xs, edges) / counts).tolist()
+    avg_ys = (np.add.reduceat(ys, edges) / counts).tolist()
+
+    # Buckets only hold a handful of points, where plain floats are much
+    # cheaper than a numpy call per bucket.
+    xs, ys, edges = xs.tolist(), ys.tolist(), edges.tolist()
+    selected = [0]
+    a = 0
+    for i in range(threshold - 2):
+        px, py = xs[a], ys[a]
+        avg_x, avg_y = avg_xs[i + 1], avg_ys[i + 1]
+        best_area = -1.0
+        for j in range(edges[i], edges[i + 1]):
+            area = abs((px - avg_x) * (ys[j] - py) - (px - xs[j]) * (avg_y - py))
+            if area > best_area:
+                best_area, a = area, j
+        selected.append(a)
+    selected.append(n - 1)
+
+    return x[selected], y[selected]
+
+
+def plot_series(
+    ax: "Axes",
+    x: typing.Sequence,
+    y: typing.Sequence,
+    label: str,
+    scale: str,
+    downsample: bool,
+):
+    if not downsample:
+        ax.plot(x, y, marker="o", label=label)
+        return
+
+    x, y = lttb(x, y, int(ax.get_window_extent().width), log=scale == "log")
+    ax.plot(
+        x, y, marker="o", markevery=max(1, math.ceil(len(y) / MAX_MARKERS)), label=label
+    )
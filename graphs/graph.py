@@ -1,44 +1,70 @@
 import asyncio
+import typing
 from io import BytesIO
 
-import matplotlib.dates as mdates
-from matplotlib import pyplot as plt
-
 from country_day_data import CountryDataList
+from utils import Timings
+
+from .downsample import plot_series
+from .pyplot import pyplot
+from .render import ImageOptions, render
 
+if typing.TYPE_CHECKING:
+    from matplotlib.axes import Axes
 
-def _graph(countries: CountryDataList, title: str, scale: str) -> BytesIO:
-    fig, ax = plt.subplots()
 
-    for country, label, (x, y) in countries:
-        ax.plot(x, y, marker="o", label=label)
-        ax.annotate(
-            y[-1],
-            xy=(1, y[-1]),
-            xytext=(5, -5),
-            xycoords=("axes fraction", "data"),
-            textcoords="offset pixels",
-        )
+def format_date_axis(ax: "Axes"):
+    import matplotlib.dates as mdates
 
     locator = mdates.AutoDateLocator(minticks=3, maxticks=9)
     formatter = mdates.ConciseDateFormatter(locator, show_offset=False)
     ax.xaxis.set_major_locator(locator)
     ax.xaxis.set_major_formatter(formatter)
 
-    ax.set_yscale(scale)
-    ax.set_title(f"{title} vs Time")
-    ax.set_xlabel("Date")
-    ax.set_ylabel(f"Number of {title}")
-    ax.legend()
-    fig.tight_layout()
 
-    buf = BytesIO()
-    fig.savefig(buf, format="png")
-    buf.seek(0)
-    return buf
+def _graph(
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    downsample: bool,
+    options: ImageOptions,
+    timings: Timings,
+) -> BytesIO:
+    with timings.stage("plot"):
+        fig, ax = pyplot().subplots()
+
+        for country, label, (x, y) in countries:
+            plot_series(ax, x, y, label, scale, downsample)
+            ax.annotate(
+                y[-1],
+                xy=(1, y[-1]),
+                xytext=(5, -5),
+                xycoords=("axes fraction", "data"),
+                textcoords="offset pixels",
+            )
+
+        format_date_axis(ax)
+        ax.set_yscale(scale)
+        ax.set_title(f"{title} vs Time")
+        ax.set_xlabel("Date")
+        ax.set_ylabel(f"Number of {title}")
+        ax.legend()
+
+    return render(fig, timings, options)
 
 
-async def graph(countries: CountryDataList, title: str, scale: str) -> BytesIO:
+async def graph(
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    downsample: bool = True,
+    options: ImageOptions = ImageOptions(),
+    timings: typing.Optional[Timings] = None,
+) -> BytesIO:
+    timings = timings or Timings()
     return await asyncio.get_event_loop().run_in_executor(
-        None, _graph, countries, title, scale,
+        None,
+        timings.in_executor(
+            _graph, countries, title, scale, downsample, options, timings
+        ),
     )
@@ -0,0 +1,83 @@
+import asyncio
+import math
+import typing
+from io import BytesIO
+
+from country_day_data import CountryDataList
+from utils import Timings
+
+from .downsample import plot_series
+from .graph import format_date_axis
+from .pyplot import pyplot
+from .render import ImageOptions, render
+
+# Size of a single subplot in inches.
+CELL_SIZE = (3.2, 2.4)
+
+
+def _graph_grid(
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    sharey: bool,
+    downsample: bool,
+    options: ImageOptions,
+    timings: Timings,
+) -> BytesIO:
+    with timings.stage("plot"):
+        # One subplot per country, holding all of that country's series.
+        cells = {}
+        for country, label, axes in countries:
+            cells.setdefault(country.identifier, (country, []))[1].append((label, axes))
+
+        columns = math.ceil(math.sqrt(len(cells)))
+        rows = math.ceil(len(cells) / columns)
+        fig, grid = pyplot().subplots(
+            rows,
+            columns,
+            sharex=True,
+            sharey=sharey,
+            squeeze=False,
+            figsize=(CELL_SIZE[0] * columns, CELL_SIZE[1] * rows),
+        )
+        grid = grid.flatten()
+
+        for i, (country, series) in enumerate(cells.values()):
+            ax = grid[i]
+            for label, (x, y) in series:
+                plot_series(ax, x, y, label, scale, downsample)
+            ax.set_title(country.country.name, fontsize="medium")
+            ax.set_yscale(scale)
+            if len(series) > 1:
+                ax.legend(fontsize="small")
+            # The shared x axis only labels the bottom row, so cells without
+            # a cell below them label their own.
+            if i + columns >= len(cells):
+                ax.tick_params(labelbottom=True)
+
+        for i in range(len(cells), len(grid)):
+            fig.delaxes(grid[i])
+
+        # Shared axes share their ticker, so this applies to every cell.
+        format_date_axis(grid[0])
+        fig.suptitle(f"{title} vs Time")
+
+    return render(fig, timings, options, layout_rect=(0, 0, 1, 0.95))
+
+
+async def graph_grid(
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    sharey: bool = True,
+    downsample: bool = True,
+    options: ImageOptions = ImageOptions(),
+    timings: typing.Optional[Timings] = None,
+) -> BytesIO:
+    timings = timings or Timings()
+    return await asyncio.get_event_loop().run_in_executor(
+        None,
+        timings.in_executor(
+            _graph_grid, countries, title, scale, sharey, downsample, options, timings
+        ),
+    )
@@ -1,9 +1,13 @@
 import asyncio
+import typing
 from io import BytesIO
 
-from matplotlib import pyplot as plt
-
 from country_day_data import CountryData, CountryDataList
+from utils import Timings
+
+from .downsample import plot_series
+from .pyplot import pyplot
+from .render import ImageOptions, render
 
 
 def offset_since_confirmed(country: CountryData, since_nth_case: int) -> int:
@@ -21,60 +25,82 @@ def st_nd_th(since_nth_case: int) -> str:
 
 
 def _graph_since_nth_case(
-    countries: CountryDataList, title: str, scale: str, since_nth_case: int
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    since_nth_case: int,
+    downsample: bool,
+    options: ImageOptions,
+    timings: Timings,
 ) -> BytesIO:
-    countries = [
-        (c, l, offset_since_confirmed(c, since_nth_case), (x, y))
-        for c, l, (x, y) in countries
-    ]
-    first_country = countries[0]
-    length = len(first_country[3][1]) - first_country[2]
+    with timings.stage("plot"):
+        countries = [
+            (c, l, offset_since_confirmed(c, since_nth_case), (x, y))
+            for c, l, (x, y) in countries
+        ]
+        first_country = countries[0]
+        length = len(first_country[3][1]) - first_country[2]
 
-    fig, ax = plt.subplots()
+        fig, ax = pyplot().subplots()
 
-    for country, label, offset, (x, y) in countries:
-        if offset == -1:
-            continue
+        for country, label, offset, (x, y) in countries:
+            if offset == -1:
+                continue
 
-        off_len = offset + length
-        y_plot = y[offset:off_len]
-        ax.plot(
-            range(len(y_plot)),
-            y_plot,
-            marker="o",
-            label=(
-                f"{label} ({offset:+} Day{'s' if offset != 1 else ''})"
-                if since_nth_case
-                else label
-            ),
-        )
-        ax.annotate(
-            y_plot[-1],
-            xy=(1, y_plot[-1]),
-            xytext=(5, -5),
-            xycoords=("axes fraction", "data"),
-            textcoords="offset pixels",
-        )
+            off_len = offset + length
+            y_plot = y[offset:off_len]
+            plot_series(
+                ax,
+                range(len(y_plot)),
+                y_plot,
+                (
+                    f"{label} ({offset:+} Day{'s' if offset != 1 else ''})"
+                    if since_nth_case
+                    else label
+                ),
+                scale,
+                downsample,
+            )
+            ax.annotate(
+                y_plot[-1],
+                xy=(1, y_plot[-1]),
+                xytext=(5, -5),
+                xycoords=("axes fraction", "data"),
+                textcoords="offset pixels",
+            )
 
-    ax.set_yscale(scale)
-    ax.set_title(f"{title} vs Days Since {st_nd_th(since_nth_case)} Confirmed Case")
-    ax.set_xlabel(
-        f"Days Since {st_nd_th(since_nth_case)} Confirmed Case "
-        f"({length} Day{'s' if length != 1 else ''} for {first_country[0].country.name})"
-    )
-    ax.set_ylabel(f"Number of {title}")
-    ax.legend()
-    fig.tight_layout()
+        ax.set_yscale(scale)
+        ax.set_title(f"{title} vs Days Since {st_nd_th(since_nth_case)} Confirmed Case")
+        ax.set_xlabel(
+            f"Days Since {st_nd_th(since_nth_case)} Confirmed Case "
+            f"({length} Day{'s' if length != 1 else ''} for {first_country[0].country.name})"
+        )
+        ax.set_ylabel(f"Number of {title}")
+        ax.legend()
 
-    buf = BytesIO()
-    fig.savefig(buf, format="png")
-    buf.seek(0)
-    return buf
+    return render(fig, timings, options)
 
 
 async def graph_since_nth_case(
-    countries: CountryDataList, title: str, scale: str, since_nth_case: int,
+    countries: CountryDataList,
+    title: str,
+    scale: str,
+    since_nth_case: int,
+    downsample: bool = True,
+    options: ImageOptions = ImageOptions(),
+    timings: typing.Optional[Timings] = None,
 ) -> BytesIO:
+    timings = timings or Timings()
     return await asyncio.get_event_loop().run_in_executor(
-        None, _graph_since_nth_case, countries, title, scale, since_nth_case
+        None,
+        timings.in_executor(
+            _graph_since_nth_case,
+            countries,
+            title,
+            scale,
+            since_nth_case,
+            downsample,
+            options,
+            timings,
+        ),
     )
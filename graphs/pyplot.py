@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import typing
+from pathlib import Path
+
+from aiohttp import web
+
+if typing.TYPE_CHECKING:
+    from matplotlib import pyplot as plt
+
+STYLE = Path(__file__).resolve().parent.parent / "discord.mplstyle"
+
+_pyplot = None
+
+
+def pyplot() -> "plt":
+    # matplotlib is only imported by whatever renders first, which keeps it
+    # out of process startup and out of processes that never render.
+    global _pyplot
+    if _pyplot is None:
+        from matplotlib import pyplot as plt
+
+        plt.style.use(str(STYLE))
+        _pyplot = plt
+    return _pyplot
+
+
+def _log_preload_error(future: asyncio.Future):
+    if not future.cancelled() and future.exception() is not None:
+        logging.error("Preloading matplotlib failed", exc_info=future.exception())
+
+
+async def preload_pyplot(app: web.Application):
+    app["pyplot_preload"] = asyncio.get_event_loop().run_in_executor(None, pyplot)
+    app["pyplot_preload"].add_done_callback(_log_preload_error)
@@ -0,0 +1,95 @@
+import typing
+from dataclasses import dataclass
+from importlib.util import find_spec
+from io import BytesIO
+
+import numpy as np
+
+from utils import Timings
+
+from .pyplot import pyplot
+
+if typing.TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+HAS_PILLOW = find_spec("PIL") is not None
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "webp": "image/webp",
+}
+
+# Pillow's Image.Quantize.FASTOCTREE, the only method that supports RGBA.
+FASTOCTREE = 2
+
+
+@dataclass(frozen=True)
+class ImageOptions:
+    format: str = "png"
+    compression: typing.Optional[int] = None
+    colors: typing.Optional[int] = None
+
+    @property
+    def needs_pillow(self) -> bool:
+        return (
+            self.format == "webp"
+            or self.compression is not None
+            or self.colors is not None
+        )
+
+
+def _encode_raster(fig: "Figure", options: ImageOptions) -> BytesIO:
+    buf = BytesIO()
+    rgba = np.asarray(fig.canvas.buffer_rgba())
+
+    if not options.needs_pillow:
+        from matplotlib import image as mimage
+
+        mimage.imsave(buf, rgba, format="png", dpi=fig.dpi)
+        return buf
+
+    from PIL import Image
+
+    image = Image.fromarray(rgba, "RGBA")
+    if options.format == "webp":
+        image.save(buf, format="WEBP", lossless=True)
+        return buf
+
+    if options.colors is not None:
+        image = image.quantize(colors=options.colors, method=FASTOCTREE)
+    image.save(
+        buf,
+        format="PNG",
+        compress_level=6 if options.compression is None else options.compression,
+        dpi=(fig.dpi, fig.dpi),
+    )
+    return buf
+
+
+def render(
+    fig: "Figure",
+    timings: Timings,
+    options: ImageOptions = ImageOptions(),
+    layout_rect: typing.Tuple[float, float, float, float] = (0, 0, 1, 1),
+) -> BytesIO:
+    # Vector output is written straight from the artists, there is no raster
+    # canvas to draw.
+    if options.format == "svg":
+        with timings.stage("draw"):
+            fig.tight_layout(rect=layout_rect)
+        with timings.stage("encode"):
+            buf = BytesIO()
+            fig.savefig(buf, format="svg")
+    else:
+        with timings.stage("draw"):
+            fig.tight_layout(rect=layout_rect)
+            fig.canvas.draw()
+
+        # Encode the already drawn canvas; fig.savefig would render it again.
+        with timings.stage("encode"):
+            buf = _encode_raster(fig, options)
+
+    pyplot().close(fig)
+    buf.seek(0)
+    return buf
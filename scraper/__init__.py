@@ -1,3 +1,8 @@
-from .scraper import initialize_data
+from .backfill import backfill_daily_reports
+from .scraper import build_region_index, initialize_data
 
-__all__ = ("initialize_data",)
+__all__ = (
+    "backfill_daily_reports",
+    "build_region_index",
+    "initialize_data",
+)
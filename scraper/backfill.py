@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import re
+import typing
+from csv import DictReader
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from aiohttp import ClientError, ClientSession
+
+from country_day_data import CountryDayData, DailyReport
+
+DAILY_REPORTS_URL = (
+    "https://raw.githubusercontent.com/CSSEGISandData/COVID-19/master/"
+    "csse_covid_19_data/csse_covid_19_daily_reports"
+)
+FIRST_REPORT_DAY = date(2020, 1, 22)
+# A report still missing this long after its day is taken to never be published;
+# the CSSE daily reports stopped in March 2023.
+MISSING_AFTER = timedelta(days=7)
+
+COLUMN_ALIASES = {
+    "Country/Region": "Country_Region",
+    "Last Update": "Last_Update",
+    "Latitude": "Lat",
+    "Longitude": "Long_",
+    "Province/State": "Province_State",
+}
+
+# Early March 2020 reports list US cases per place, e.g. "King County, WA" or
+# "Omaha, NE (From Diamond Princess)", before switching to states.
+US_PLACE = re.compile(
+    r"^.+, (?P<state>[A-Z]{2}|D\.C\.)(?: \(From Diamond Princess\))?$"
+)
+US_STATES = {
+    "AK": "Alaska",
+    "AL": "Alabama",
+    "AR": "Arkansas",
+    "AZ": "Arizona",
+    "CA": "California",
+    "CO": "Colorado",
+    "CT": "Connecticut",
+    "D.C.": "District of Columbia",
+    "DC": "District of Columbia",
+    "DE": "Delaware",
+    "FL": "Florida",
+    "GA": "Georgia",
+    "HI": "Hawaii",
+    "IA": "Iowa",
+    "ID": "Idaho",
+    "IL": "Illinois",
+    "IN": "Indiana",
+    "KS": "Kansas",
+    "KY": "Kentucky",
+    "LA": "Louisiana",
+    "MA": "Massachusetts",
+    "MD": "Maryland",
+    "ME": "Maine",
+    "MI": "Michigan",
+    "MN": "Minnesota",
+    "MO": "Missouri",
+    "MS": "Mississippi",
+    "MT": "Montana",
+    "NC": "North Carolina",
+    "ND": "North Dakota",
+    "NE": "Nebraska",
+    "NH": "New Hampshire",
+    "NJ": "New Jersey",
+    "NM": "New Mexico",
+    "NV": "Nevada",
+    "NY": "New York",
+    "OH": "Ohio",
+    "OK": "Oklahoma",
+    "OR": "Oregon",
+    "PA": "Pennsylvania",
+    "PR": "Puerto Rico",
+    "RI": "Rhode Island",
+    "SC": "South Carolina",
+    "SD": "South Dakota",
+    "TN": "Tennessee",
+    "TX": "Texas",
+    "UT": "Utah",
+    "VA": "Virginia",
+    "VI": "Virgin Islands",
+    "VT": "Vermont",
+    "WA": "Washington",
+    "WI": "Wisconsin",
+    "WV": "West Virginia",
+    "WY": "Wyoming",
+}
+
+# Parsed reports by cache path, None for reports that will never be published.
+# Cached reports never change, so a refresh only parses the days it hasn't seen
+# yet.
+PARSED_REPORTS = {}
+
+
+def report_name(day: date) -> str:
+    return day.strftime("%m-%d-%Y")
+
+
+def normalize_row(row: dict) -> dict:
+    out = {
+        COLUMN_ALIASES.get(key.strip(), key.strip()): (value or "").strip()
+        for key, value in row.items()
+        if key is not None
+    }
+    if out.get("Province_State") == out.get("Country_Region"):
+        out["Province_State"] = ""
+    if out.get("Country_Region") == "US":
+        match = US_PLACE.match(out.get("Province_State", ""))
+        if match is not None and match["state"] in US_STATES:
+            out["Province_State"] = US_STATES[match["state"]]
+    return out
+
+
+def parse_daily_report(text: str, day: date) -> DailyReport:
+    # Since 03-22-2020 the US is reported per county, and in early March per
+    # place, so rows are summed up to the province or state level the rest of
+    # the data uses.
+    totals = {}
+    for row in DictReader(text.splitlines()):
+        row = normalize_row(row)
+        try:
+            data = CountryDayData.init_csv_row(row, day)
+        except (KeyError, ValueError):
+            logging.warning("Skipping row in %s: %s", report_name(day), row)
+            continue
+
+        key = (data.country.alpha_3, data.province_state)
+        total = totals.get(key)
+        totals[key] = (
+            data
+            if total is None
+            else replace(
+                total,
+                last_update=max(total.last_update, data.last_update),
+                confirmed=total.confirmed + data.confirmed,
+                deaths=total.deaths + data.deaths,
+                recovered=total.recovered + data.recovered,
+            )
+        )
+
+    return DailyReport.from_rows(day, totals.values())
+
+
+async def fetch_daily_report(
+    session: ClientSession, source: str, name: str
+) -> typing.Optional[str]:
+    if not source.startswith(("http://", "https://")):
+        path = Path(source) / f"{name}.csv"
+        return path.read_text(encoding="utf-8-sig") if path.exists() else None
+
+    async with session.get(f"{source}/{name}.csv") as resp:
+        if resp.status == 404:
+            return None
+        resp.raise_for_status()
+        return await resp.text(encoding="utf-8-sig")
+
+
+async def load_daily_report(
+    session: ClientSession,
+    source: str,
+    cache_dir: Path,
+    day: date,
+    semaphore: asyncio.Semaphore,
+) -> typing.Optional[DailyReport]:
+    name = report_name(day)
+    cached = cache_dir / f"{name}.csv"
+    missing = cache_dir / f"{name}.missing"
+    if cached in PARSED_REPORTS:
+        return PARSED_REPORTS[cached]
+    if missing.exists():
+        PARSED_REPORTS[cached] = None
+        return None
+
+    loop = asyncio.get_event_loop()
+    if cached.exists():
+        text = await loop.run_in_executor(None, cached.read_text, "utf-8")
+    else:
+        try:
+            async with semaphore:
+                text = await fetch_daily_report(session, source, name)
+        except (ClientError, asyncio.TimeoutError) as e:
+            # Retried on the next refresh.
+            logging.warning("Fetching the daily report for %s failed: %s", name, e)
+            return None
+
+        if text is None:
+            logging.info("No daily report for %s", name)
+            if datetime.utcnow().date() - day > MISSING_AFTER:
+                missing.touch()
+                PARSED_REPORTS[cached] = None
+            return None
+
+        # Write through a temporary file so an interrupted run never leaves a
+        # truncated report in the cache.
+        partial = cache_dir / f"{name}.csv.part"
+        partial.write_text(text, encoding="utf-8")
+        partial.replace(cached)
+
+    # Parsing a county-era report takes tens of milliseconds; keep it off the
+    # event loop.
+    report = await loop.run_in_executor(None, parse_daily_report, text, day)
+    PARSED_REPORTS[cached] = report
+    return report
+
+
+async def backfill_daily_reports(
+    session: ClientSession,
+    cache_dir: typing.Union[str, Path],
+    source: str = DAILY_REPORTS_URL,
+    concurrency: int = 8,
+    until: typing.Optional[date] = None,
+) -> typing.List[DailyReport]:
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    until = until or datetime.utcnow().date() - timedelta(days=1)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    reports = await asyncio.gather(
+        *(
+            load_daily_report(
+                session, source, cache_dir, FIRST_REPORT_DAY + timedelta(i), semaphore
+            )
+            for i in range((until - FIRST_REPORT_DAY).days + 1)
+        )
+    )
+    return [report for report in reports if report is not None]
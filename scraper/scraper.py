@@ -1,19 +1,24 @@
+import asyncio
 import typing
 from csv import DictReader
-from datetime import date, datetime
-from itertools import groupby
+from datetime import date, datetime, timedelta
 
-import pycountry
+import numpy as np
 from aiohttp import ClientSession
 
+from countries import Country, region_identifier
 from country_day_data import (
-    CountryData,
-    CountryDataList,
+    EPOCH,
+    SERIES,
     CountryDayData,
     CountryDayDataList,
-    DayData,
+    DailyReport,
+    RegionIndex,
+    daily_reports,
 )
 
+from .backfill import backfill_daily_reports
+
 
 async def download_csv_file(
     session: ClientSession, url: str, day: typing.Optional[date] = None
@@ -21,7 +26,9 @@ async def download_csv_file(
     async with session.get(url) as resp:
         rows = DictReader((await resp.text()).splitlines())
         return [
-            CountryDayData.init_csv_row(row, day) for row in rows if not row.get("FIPS")
+            CountryDayData.init_csv_row(row, day)
+            for row in rows
+            if not row.get("Admin2")
         ]
 
 
@@ -33,6 +40,14 @@ async def download_current_data(session: ClientSession) -> CountryDayDataList:
     )
 
 
+async def download_current_region_data(session: ClientSession) -> CountryDayDataList:
+    return await download_csv_file(
+        session,
+        "https://raw.githubusercontent.com/CSSEGISandData/COVID-19/web-data/data/cases_state.csv",
+        datetime.utcnow().date(),
+    )
+
+
 async def download_historical_data(session: ClientSession) -> CountryDayDataList:
     return await download_csv_file(
         session,
@@ -40,53 +55,132 @@ async def download_historical_data(session: ClientSession) -> CountryDayDataList
     )
 
 
-def group_country(data: CountryDayDataList) -> CountryDataList:
-    data.sort(key=lambda d: d.day)
-    data.sort(key=lambda d: d.country.alpha_3)
-
-    out_data = {
-        c[0].country.alpha_3: CountryData(
-            c[0].country,
-            max(c, key=lambda d: d.last_update).last_update,
-            [
-                DayData(
-                    days[0].day,
-                    sum(d.confirmed for d in days),
-                    sum(d.deaths for d in days),
-                    sum(d.recovered for d in days),
-                )
-                for days in (list(d) for _, d in groupby(c, key=lambda d: d.day))
-            ],
+NOT_UPDATED = np.iinfo(np.int64).min
+
+
+def _forward_fill(values: np.ndarray, reported: np.ndarray) -> np.ndarray:
+    # values is (node, series, day) and reported is (node, day); each day takes
+    # the values of the node's latest reported day up to it.
+    latest_day = np.where(reported, np.arange(reported.shape[1]), 0)
+    np.maximum.accumulate(latest_day, axis=1, out=latest_day)
+    return np.take_along_axis(values, latest_day[:, np.newaxis, :], axis=2)
+
+
+def build_region_index(
+    data: CountryDayDataList, reports: typing.Sequence[DailyReport] = ()
+) -> RegionIndex:
+    reports = [*daily_reports(data), *reports]
+    first_day = min(r.day for r in reports)
+    days = np.arange(
+        np.datetime64(first_day, "D"),
+        np.datetime64(max(r.day for r in reports), "D") + 1,
+    )
+
+    countries = {}
+    regions = {}
+    identifiers = {}
+    for key in set().union(*(r.keys for r in reports)):
+        country, province_state = key
+        country_id = country.alpha_3
+        countries[country_id] = country
+        identifier = country_id
+        if province_state:
+            identifier = region_identifier(country_id, province_state)
+            regions[identifier] = (province_state, country_id)
+        identifiers[key] = identifier
+
+    nodes = [
+        (
+            Country(
+                name=f"{province_state}, {countries[country_id].name}",
+                alpha_2=f"{countries[country_id].alpha_2}{identifier[len(country_id):]}",
+                alpha_3=identifier,
+            ),
+            identifier,
+            country_id,
+        )
+        for identifier, (province_state, country_id) in sorted(regions.items())
+    ]
+    nodes += [(countries[c], c, "GLOBAL") for c in sorted(countries)]
+    nodes.append(
+        (
+            Country(name="Global", alpha_3="GLOBAL", alpha_2="GLOBAL"),
+            "GLOBAL",
+            None,
         )
-        for c in (list(c) for _, c in groupby(data, key=lambda c: c.country.alpha_3))
+    )
+    positions = {identifier: i for i, (_, identifier, _) in enumerate(nodes)}
+    key_positions = {
+        key: positions[identifier] for key, identifier in identifiers.items()
     }
 
-    data.sort(key=lambda d: d.day)
-    out_data["GLOBAL"] = CountryData(
-        pycountry.db.Data(name="Global", alpha_3="GLOBAL", alpha_2="GLOBAL"),
-        max(data, key=lambda d: d.last_update).last_update,
+    # Keep the most recent report of each node per day; a backfilled report and
+    # the CSSE web data can cover the same day.
+    values = np.zeros((len(nodes), len(SERIES), len(days)), dtype=np.int32)
+    updated = np.full((len(nodes), len(days)), NOT_UPDATED)
+    for report in reports:
+        rows = np.array([key_positions[key] for key in report.keys], dtype=np.intp)
+        j = (report.day - first_day).days
+        newer = report.last_updates > updated[rows, j]
+        values[rows[newer], :, j] = report.counts[newer]
+        updated[rows[newer], j] = report.last_updates[newer]
+    reported = updated != NOT_UPDATED
+    last_updates = updated.max(axis=1)
+
+    # Series are cumulative, so a day without a report keeps the previous
+    # report's counts; otherwise the sums below would dip on those days.
+    region_rows = slice(0, len(regions))
+    values[region_rows] = _forward_fill(values[region_rows], reported[region_rows])
+
+    # Countries use their own rows where reported, and otherwise the sum of
+    # their regions once any region has reported. Global is the sum of all
+    # countries.
+    children = {}
+    for identifier, (_, country_id) in regions.items():
+        children.setdefault(country_id, []).append(positions[identifier])
+    for country_id, region_positions in children.items():
+        i = positions[country_id]
+        values[i] = np.where(
+            reported[i], values[i], values[region_positions].sum(axis=0)
+        )
+        reported[i] |= np.logical_or.accumulate(reported[region_positions].any(axis=0))
+        last_updates[i] = last_updates[[i, *region_positions]].max()
+
+    country_positions = slice(len(regions), len(regions) + len(countries))
+    values[country_positions] = _forward_fill(
+        values[country_positions], reported[country_positions]
+    )
+    values[positions["GLOBAL"]] = values[country_positions].sum(axis=0)
+    last_updates[positions["GLOBAL"]] = last_updates[country_positions].max()
+
+    return RegionIndex(
+        days,
+        values,
         [
-            DayData(
-                days[0].day,
-                sum(d.confirmed for d in days),
-                sum(d.deaths for d in days),
-                sum(d.recovered for d in days),
-            )
-            for days in (list(d) for _, d in groupby(data, key=lambda d: d.day))
+            (country, identifier, parent, EPOCH + timedelta(microseconds=int(update)))
+            for (country, identifier, parent), update in zip(nodes, last_updates)
         ],
     )
 
-    return out_data
-
 
-async def initialize_data(session: ClientSession) -> CountryDataList:
+async def initialize_data(
+    session: ClientSession, backfill_dir: typing.Optional[str] = None
+) -> RegionIndex:
     data = [
         row
         for csv_file in [
             await download_historical_data(session),
             await download_current_data(session),
+            await download_current_region_data(session),
         ]
         for row in csv_file
     ]
+    reports = (
+        await backfill_daily_reports(session, backfill_dir) if backfill_dir else []
+    )
 
-    return group_country(data)
+    # Building the index takes a while with the backfilled reports, keep it
+    # off the event loop.
+    return await asyncio.get_event_loop().run_in_executor(
+        None, build_region_index, data, reports
+    )
@@ -1,9 +1,17 @@
 from .axes_data import axes_data
 from .init_startup import init_startup
+from .render_cache import RenderCache
+from .shared_data import load_published_data, load_shared_data, publish_data
+from .timings import Timings
 from .update_data import update_data
 
 __all__ = (
     "axes_data",
     "init_startup",
+    "load_published_data",
+    "load_shared_data",
+    "publish_data",
+    "RenderCache",
+    "Timings",
     "update_data",
 )
@@ -1,5 +1,6 @@
 import typing
-from datetime import date
+
+import numpy as np
 
 from country_day_data import CountryData, CountryDataList
 
@@ -8,9 +9,7 @@ from .series_label import series_label
 
 def axes_data(
     countries: CountryDataList, series: typing.Sequence[str]
-) -> typing.List[
-    typing.Tuple[CountryData, str, typing.Tuple[typing.List[date], typing.List[int]]]
-]:
+) -> typing.List[typing.Tuple[CountryData, str, typing.Tuple[np.ndarray, np.ndarray]]]:
     multi_series = len(series) > 1
 
     def get_one(c: CountryData, s: str):
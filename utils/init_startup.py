@@ -1,7 +1,11 @@
 from aiohttp import web
 
+from .shared_data import load_shared_data
 from .update_data import update_data
 
 
 def init_startup(app: web.Application):
-    app.on_startup.extend([update_data])
+    if app["shared_data_dir"] is None:
+        app.on_startup.extend([update_data])
+    else:
+        app.on_startup.extend([load_shared_data])
@@ -0,0 +1,20 @@
+import typing
+from collections import OrderedDict
+
+
+class RenderCache:
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[typing.Hashable, bytes]" = OrderedDict()
+
+    def get(self, key: typing.Hashable) -> typing.Optional[bytes]:
+        value = self.entries.get(key)
+        if value is not None:
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key: typing.Hashable, value: bytes):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
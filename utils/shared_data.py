@@ -0,0 +1,74 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import signal
+import typing
+from pathlib import Path
+from time import time_ns
+
+import numpy as np
+from aiohttp import web
+
+from country_day_data import RegionIndex
+
+CURRENT_VERSION_FILE = "current"
+VERSION_FILE = re.compile(r"^(?P<version>\d+)\.(?:npy|json)(?:\.part)?$")
+
+
+def _replace_atomically(path: Path, write: typing.Callable[[typing.IO], None]):
+    partial = path.with_name(f"{path.name}.part")
+    with partial.open("wb") as f:
+        write(f)
+    os.replace(partial, path)
+
+
+def publish_data(data_dir: typing.Union[str, Path], data: RegionIndex) -> str:
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    current = data_dir / CURRENT_VERSION_FILE
+    previous = current.read_text() if current.exists() else None
+    version = str(time_ns())
+
+    _replace_atomically(
+        data_dir / f"{version}.npy", lambda f: np.save(f, np.asarray(data.values))
+    )
+    _replace_atomically(
+        data_dir / f"{version}.json",
+        lambda f: f.write(json.dumps(data.to_metadata()).encode()),
+    )
+    _replace_atomically(current, lambda f: f.write(version.encode()))
+
+    # Workers may still be mapping the previous version, anything older is
+    # no longer referenced. Only dataset files are removed, the directory may
+    # hold anything else.
+    for path in data_dir.iterdir():
+        match = VERSION_FILE.match(path.name)
+        if match is not None and match["version"] not in (version, previous):
+            path.unlink()
+
+    return version
+
+
+def load_published_data(
+    data_dir: typing.Union[str, Path],
+) -> typing.Tuple[str, RegionIndex]:
+    data_dir = Path(data_dir)
+    version = (data_dir / CURRENT_VERSION_FILE).read_text()
+    metadata = json.loads((data_dir / f"{version}.json").read_text())
+    values = np.load(data_dir / f"{version}.npy", mmap_mode="r")
+    return version, RegionIndex.from_metadata(metadata, values)
+
+
+async def load_shared_data(app: web.Application):
+    def reload():
+        version, data = load_published_data(app["shared_data_dir"])
+        if version != app.get("data_version"):
+            app["data_version"], app["data"] = version, data
+            logging.info("Mapped data version %s", version)
+
+    # Install the handler before the first load, so a refresh published in
+    # between still gets mapped.
+    asyncio.get_event_loop().add_signal_handler(signal.SIGHUP, reload)
+    reload()
@@ -0,0 +1,43 @@
+import cProfile
+import typing
+from contextlib import contextmanager
+from time import perf_counter
+
+
+class Timings:
+    def __init__(self, profile: bool = False):
+        self.stages: typing.List[typing.Tuple[str, float]] = []
+        self.profile = profile
+        self.profilers: typing.List[cProfile.Profile] = []
+
+    def record(self, name: str, seconds: float):
+        self.stages.append((name, seconds))
+
+    @contextmanager
+    def stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, perf_counter() - start)
+
+    def in_executor(self, func: typing.Callable, *args) -> typing.Callable:
+        submitted = perf_counter()
+
+        def run():
+            self.record("queue", perf_counter() - submitted)
+            if not self.profile:
+                return func(*args)
+
+            # cProfile only sees the thread it was enabled in, so the executor
+            # thread gets its own profiler which is merged in when dumping.
+            profiler = cProfile.Profile()
+            self.profilers.append(profiler)
+            return profiler.runcall(func, *args)
+
+        return run
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages
+        )
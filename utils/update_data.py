@@ -1,10 +1,19 @@
+import os
+import signal
+from time import time_ns
+
 from aiohttp import ClientSession, web
 
 from scraper import initialize_data
 
 
 async def update_data(app: web.Application):
+    # Workers only map the data; the refresher process fetches and publishes it.
+    if app["shared_data_dir"] is not None:
+        os.kill(os.getppid(), signal.SIGUSR1)
+        return
+
     async with ClientSession() as session:
-        data = await initialize_data(session)
+        data = await initialize_data(session, app.get("backfill_dir"))
 
-    app["data"] = data
+    app["data_version"], app["data"] = str(time_ns()), data